@@ -1,3 +1,4 @@
+import os
 import threading
 import contextvars
 import copy
@@ -203,7 +204,19 @@ class Globals(metaclass=SingletonABCMeta):
 
     @property
     def pickled_data(self):
-        return obj2str(self._data)
+        data = self._data
+        # Most sessions never write globals, so their data still equals the pristine defaults and
+        # one shared encoding can be reused instead of re-pickling the session dict on every call.
+        # A write-versioned cache would be unsound here: nested containers are mutated in place
+        # (e.g. `globals['usage'][mid] = ...`) without passing through the top-level `__setitem__`.
+        cls = type(self)
+        if data == cls.__global_attrs__:
+            # cached strictly per concrete class: Locals inherits this property with its own
+            # defaults and must not reuse an encoding primed through the MRO
+            if '__pristine_pickled__' not in cls.__dict__:
+                cls.__pristine_pickled__ = obj2str(data)
+            return cls.__pristine_pickled__
+        return obj2str(data)
 
     def unpickle_and_update_data(self, data: Optional[str]) -> dict:
         if data: self._data.update(str2obj(data))
@@ -411,7 +424,7 @@ global_config = _GlobalConfig()
 # used as mixin, so we do not define this class with pydantic.
 class SessionConfigableBase(object):
     def __init__(self, id: Optional[str] = None, name: Optional[str] = None, group_id: Optional[str] = None):
-        self._config_id = id or str(uuid.uuid4().hex)
+        self._config_id = id or os.urandom(16).hex()  # same 32-hex format as uuid4().hex, cheaper in bulk
         self._name = name
         self._group_id = group_id
 
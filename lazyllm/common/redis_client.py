@@ -36,6 +36,14 @@ class RedisClient(object):
     def set(self, key, value):
         return _redis_client.set(self._get_key(key), value)
 
+    def publish(self, key, value):
+        return _redis_client.publish(self._get_key(key), value)
+
+    def subscriber(self, key):
+        pubsub = _redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self._get_key(key))
+        return pubsub
+
     def delete(self, key):
         redis_client.delete(self._get_key(key) if isinstance(key, str) else [self._get_key(k) for k in key])
 
@@ -11,6 +11,8 @@ import pickle
 import base64
 import argparse
 
+from ..configs import config
+
 def check_path(
     path: Union[str, PathLike],
     exist: bool = True,
@@ -150,6 +152,23 @@ def obj2str(obj: Any) -> str:
 def str2obj(data: str) -> Any:
     return None if data is None else pickle.loads(base64.b64decode(data.encode('utf-8')))
 
+config.add('wire_format', str, 'pickle_b64', 'WIRE_FORMAT', options=['pickle_b64', 'pickle_raw'],
+           description='Payload encoding between ServerModule and its relay server. `pickle_raw` skips the '
+                       'base64 round-trip (~33% smaller payloads); `pickle_b64` is the compatible default.')
+
+def encode_wire(obj: Any) -> bytes:
+    data = pickle.dumps(obj)
+    return data if config['wire_format'] == 'pickle_raw' else base64.b64encode(data)
+
+def decode_wire(data: bytes) -> Any:
+    if data is None: return None
+    if config['wire_format'] == 'pickle_raw':
+        try:
+            return pickle.loads(data)
+        except Exception:
+            pass  # response may come from a peer still encoding in base64
+    return pickle.loads(base64.b64decode(data))
+
 def str2bool(v: str) -> bool:
     ''' Boolean type converter '''
     if isinstance(v, bool):
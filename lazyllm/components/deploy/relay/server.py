@@ -1,9 +1,7 @@
 import argparse
 import asyncio
-import codecs
 import inspect
 import os
-import pickle
 import functools
 import sys
 import time
@@ -31,7 +29,7 @@ def _inject_pythonpath(argv):
 
 _inject_pythonpath(sys.argv[1:])
 
-from lazyllm.common.utils import str2obj  # noqa: E402
+from lazyllm.common.utils import str2obj, obj2str, encode_wire  # noqa: E402
 import uvicorn  # noqa: E402
 import lazyllm  # noqa: E402
 from lazyllm import FastapiApp, globals, kwargs, load_obj, package  # noqa: E402
@@ -103,7 +101,7 @@ async def lazyllm_call(request: fastapi.Request):
         fname, call_args, call_kwargs = await request.json()
         call_args, call_kwargs = load_obj(call_args), load_obj(call_kwargs)
         r = await async_wrapper(getattr(func, fname), *call_args, **call_kwargs)
-        return fastapi.responses.Response(content=codecs.encode(pickle.dumps(r), 'base64'))
+        return fastapi.responses.Response(content=encode_wire(r))
     except requests.RequestException as e:
         return fastapi.responses.Response(content=f'{str(e)}', status_code=500)
     except Exception:
@@ -145,13 +143,12 @@ async def generate(request: fastapi.Request): # noqa C901
             ags = input if isinstance(input, package) else (input,)
         output = await async_wrapper(func, *ags, **kw)
 
-        def impl(o):
-            return codecs.encode(pickle.dumps(o), 'base64')
-
         if isinstance(output, GeneratorType):
             def generate_stream():
+                # stream frames stay base64 regardless of wire_format: raw pickle bytes may
+                # contain the delimiter the client splits on
                 for o in output:
-                    yield impl(o)
+                    yield obj2str(o).encode()
             return fastapi.responses.StreamingResponse(generate_stream(), media_type='text/plain')
         elif args.after_function:
             assert (callable(after_func)), 'after_func must be callable'
@@ -164,7 +161,10 @@ async def generate(request: fastapi.Request): # noqa C901
                     after_func(output, **{r.kwonlyargs[0]: origin})
             elif len(new_args) == 2:
                 output = after_func(output, origin)
-        return fastapi.responses.Response(content=impl(output))
+        # /generate responses go through the client's delimiter scan even when not streaming,
+        # so they must stay base64 like the stream frames; only /_call, whose client reads the
+        # body whole, may carry raw pickle
+        return fastapi.responses.Response(content=obj2str(output))
     except requests.RequestException as e:
         return fastapi.responses.Response(content=f'{str(e)}', status_code=500)
     except Exception:
@@ -20,7 +20,7 @@ from typing import Union, List, Optional
 import concurrent.futures
 from collections import deque
 import uuid
-from ..hook import LazyLLMHook, execution_with_hooks, register_hooks, resolve_builtin_hooks
+from ..hook import LazyLLMHook, HookList, execution_with_hooks, register_hooks, resolve_builtin_hooks
 from ..tracing.collect.output_attrs import push_ifs_matched_attrs, push_switch_matched_attrs
 from itertools import repeat
 
@@ -32,7 +32,7 @@ class FlowException(HandledException):
 class _FuncWrap(object):
     def __init__(self, f):
         self._f = f._f if type.__instancecheck__(_FuncWrap, f) else f
-        self._hooks = []
+        self._hooks = HookList()
         register_hooks(self, resolve_builtin_hooks(self))
 
     # Make isinstance(func_wrap, T) equivalent to isinstance(func_wrap._f, T) for all T,
@@ -238,7 +238,7 @@ class LazyLLMFlowsBase(FlowBase, metaclass=LazyLLMRegisterMetaClass):
                                         id=id, name=name, group_id=group_id)
         self.post_action = post_action() if isinstance(post_action, type) else post_action
         self._sync = False
-        self._hooks = []
+        self._hooks = HookList()
         register_hooks(self, resolve_builtin_hooks(self))
 
     @execution_with_hooks
@@ -264,7 +264,7 @@ class LazyLLMFlowsBase(FlowBase, metaclass=LazyLLMRegisterMetaClass):
             self._hooks.remove(hook_type)
 
     def clear_hooks(self):
-        self._hooks = []
+        self._hooks = HookList()
 
     def _post_process(self, output):
         return output
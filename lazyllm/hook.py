@@ -141,6 +141,44 @@ def resolve_builtin_hooks(obj):
     return hooks
 
 
+class HookList(list):
+    '''Registration list for `_hooks` that keeps a priority-sorted materialization plan, so each
+    call materializes hooks without re-sorting or isinstance checks in the hot loop. The plan is
+    rebuilt lazily after any mutation; plain lists keep working through the legacy path in
+    `prepare_hooks`.'''
+
+    _plan = None
+
+    def _invalidate(self):
+        self._plan = None
+
+    def append(self, hook): self._invalidate(); return super().append(hook)
+    def extend(self, hooks): self._invalidate(); return super().extend(hooks)
+    def insert(self, index, hook): self._invalidate(); return super().insert(index, hook)
+    def remove(self, hook): self._invalidate(); return super().remove(hook)
+    def pop(self, *args): self._invalidate(); return super().pop(*args)
+    def clear(self): self._invalidate(); return super().clear()
+    def __setitem__(self, index, hook): self._invalidate(); return super().__setitem__(index, hook)
+    def __delitem__(self, index): self._invalidate(); return super().__delitem__(index)
+    def __iadd__(self, hooks): self._invalidate(); return super().__iadd__(hooks)
+
+    def copy(self):
+        return HookList(self)
+
+    def __reduce__(self):
+        return HookList, (list(self),)
+
+    @property
+    def plan(self):
+        if self._plan is None:
+            for hook_type in self:
+                assert isinstance(hook_type, LazyLLMHook) or (
+                    isinstance(hook_type, type) and issubclass(hook_type, LazyLLMHook)), (
+                    f'{hook_type} is not a subclass of LazyLLMHook')
+            self._plan = [(isinstance(h, LazyLLMHook), h) for h in sorted(self, key=_hook_priority)]
+        return self._plan
+
+
 def register_hooks(obj, hooks):
     if not hooks:
         return obj
@@ -158,12 +196,12 @@ def register_hooks(obj, hooks):
 
 def prepare_hooks(obj, hook_types, *args, **kwargs):
     hook_objs = []
-    materialized_hooks = []
-    for hook_type in hook_types:
-        hook_obj = _materialize_hook(hook_type, obj)
-        materialized_hooks.append(hook_obj)
-
-    materialized_hooks.sort(key=_hook_priority)
+    if isinstance(hook_types, HookList):
+        # instance-vs-factory is precomputed together with the priority order, so materialization
+        # is a single pre-sorted pass with no isinstance checks
+        materialized_hooks = [copy.deepcopy(h) if is_instance else h(obj) for is_instance, h in hook_types.plan]
+    else:
+        materialized_hooks = sorted((_materialize_hook(t, obj) for t in hook_types), key=_hook_priority)
 
     for hook_obj in materialized_hooks:
         try:
@@ -211,9 +249,8 @@ def hook_execution(
     map_exception: Optional[Callable[[Exception], Exception]] = None,
     **hook_kwargs: Any,
 ):
-    hook_objs = tuple(
-        prepare_hooks(obj, list(getattr(obj, '_hooks', []) or []), *hook_args, **hook_kwargs)
-    )
+    hooks = getattr(obj, '_hooks', None)
+    hook_objs = tuple(prepare_hooks(obj, hooks, *hook_args, **hook_kwargs)) if hooks else ()
     _ran = False
 
     def hooked_call(fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
@@ -225,10 +262,11 @@ def hook_execution(
             r = fn(*args, **kwargs)
         except HandledException as e:
             LOG.error(f'`{type(obj).__name__}` raised {type(e).__name__}: {e}')
-            try:
-                run_hooks(hook_objs, 'on_error', e)
-            except Exception:
-                LOG.warning('Hook on_error phase failed', exc_info=True)
+            if hook_objs:
+                try:
+                    run_hooks(hook_objs, 'on_error', e)
+                except Exception:
+                    LOG.warning('Hook on_error phase failed', exc_info=True)
             raise
         except Exception as e:
             err = map_exception(e) if map_exception else e
@@ -236,24 +274,26 @@ def hook_execution(
             LOG.error(
                 f'Error in `{type(obj).__name__}`' + (f' name={nm!r}' if nm else '') + f': {err}'
             )
-            try:
-                run_hooks(hook_objs, 'on_error', err)
-            except Exception:
-                LOG.warning('Hook on_error phase failed', exc_info=True)
+            if hook_objs:
+                try:
+                    run_hooks(hook_objs, 'on_error', err)
+                except Exception:
+                    LOG.warning('Hook on_error phase failed', exc_info=True)
             if map_exception:
                 raise err from None
             raise
         else:
-            run_hooks(hook_objs, 'post_hook', r)
+            if hook_objs: run_hooks(hook_objs, 'post_hook', r)
             return r
 
     try:
         yield hooked_call
     finally:
-        try:
-            run_hooks(hook_objs, 'finalize')
-        except Exception:
-            LOG.warning('Hook finalize phase failed', exc_info=True)
+        if hook_objs:
+            try:
+                run_hooks(hook_objs, 'finalize')
+            except Exception:
+                LOG.warning('Hook finalize phase failed', exc_info=True)
 
 
 def execution_with_hooks(
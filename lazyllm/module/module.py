@@ -1,21 +1,22 @@
 import os
 import inspect
+import functools
 import traceback
+from concurrent.futures import wait, FIRST_EXCEPTION
 from lazyllm import ThreadPoolExecutor
 
 import lazyllm
 from lazyllm import FlatList, Option, kwargs, globals, locals, colored_text, redis_client
 from lazyllm.common import _register_trim_module, HandledException, _change_exception_type, SessionConfigableBase
 from ..components.formatter.formatterbase import file_content_hash, transform_path
-from ..flow import FlowBase, Pipeline, Parallel
+from ..flow import FlowBase, Pipeline
 from ..common.bind import _MetaBind
-import uuid
 import json
-from ..hook import LazyLLMHook, LazyLLMFuncHook, execution_with_hooks, register_hooks, resolve_builtin_hooks
+from ..hook import LazyLLMHook, LazyLLMFuncHook, HookList, hook_execution, register_hooks, resolve_builtin_hooks
 from lazyllm import FileSystemQueue
 from contextlib import contextmanager
 from typing import Optional, Union, Dict, List, Callable
-from collections import defaultdict
+from collections import defaultdict, deque
 import sqlite3
 import pickle
 import hashlib
@@ -32,6 +33,14 @@ lazyllm.config.add(
 )
 lazyllm.config.add('cache_mode', str, 'RW', 'CACHE_MODE', options=['RW', 'RO', 'WO', 'NONE'],
                    description='The default cache mode to use(Read and Write, Read Only, Write Only, None).')
+lazyllm.config.add('eval_max_workers', int, 200, 'EVAL_MAX_WORKERS',
+                   description='The max number of worker threads shared by parallel evalset inference.')
+lazyllm.config.add('update_train_workers', int, 0, 'UPDATE_TRAIN_WORKERS',
+                   description='Worker threads for train tasks in update(); 0 means one thread per task.')
+lazyllm.config.add('update_deploy_workers', int, 0, 'UPDATE_DEPLOY_WORKERS',
+                   description='Worker threads for async deploy tasks in update(); 0 means one thread per task.')
+lazyllm.config.add('update_eval_workers', int, 1, 'UPDATE_EVAL_WORKERS',
+                   description='Worker threads for eval tasks in update(); 1 keeps them sequential.')
 redis_client = redis_client['module']
 
 
@@ -262,16 +271,64 @@ class ModuleCache(object):
 module_cache = ModuleCache()
 
 
+@functools.lru_cache(maxsize=None)
+def _eval_executor():
+    return ThreadPoolExecutor(max_workers=lazyllm.config['eval_max_workers'])
+
+
+def _run_stage_tasks(tasks, n_jobs, *, block=True):
+    if not tasks: return
+    n_jobs = n_jobs or len(tasks)
+    if n_jobs == 1 and block:
+        for task in tasks: task()
+        return
+    executor = ThreadPoolExecutor(max_workers=min(n_jobs, len(tasks)))
+    futures = [executor.submit(task) for task in tasks]
+    executor.shutdown(wait=False)
+    if block:
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in done: future.result()
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_init_sig(cls):
+    paras = inspect.signature(cls.__init__).parameters
+    return list(paras.values())[1:], paras  # paras.value()[0] is self
+
+
 # use _MetaBind:
 # if bind a ModuleBase: x, then hope: isinstance(x, ModuleBase)==True,
 # example: ActionModule.submodules:: isinstance(x, ModuleBase) will add submodule.
 class ModuleBase(SessionConfigableBase, metaclass=_MetaBind):
     builder_keys = []  # keys in builder support Option by default
+    _overwrote_candidates = ('forward', '_get_train_tasks', '_get_deploy_tasks',
+                             '_get_post_process_tasks', '_get_eval_tasks')
+
+    def __init_subclass__(cls, **kw):
+        super().__init_subclass__(**kw)
+        cls._precompute_builder_keys()
+
+    @classmethod
+    def _precompute_builder_keys(cls):
+        # precomputed so that __getattr__, hit on every attribute miss, only pays set-membership tests
+        keys = cls.builder_keys
+        cls._builder_keys_set = frozenset(keys)
+        cls._builder_priv_keys = frozenset(f'_{k}' for k in keys)
+        cls._builder_args_keys = frozenset(f'_{k}_args' for k in keys) | \
+            frozenset(f'_{k[:-7]}_args' for k in keys if k.endswith('_method'))
+
+    @classmethod
+    def _precompute_overwrote_set(cls):
+        # computed on first use rather than at class creation: the registry attaches `forward`
+        # to its generated classes after type() has run
+        cls._overwrote_set = frozenset(
+            f for f in cls._overwrote_candidates if getattr(cls, f) is not getattr(ModuleBase, f))
+        return cls._overwrote_set
 
     def __new__(cls, *args, **kw):
-        sig = inspect.signature(cls.__init__)
-        paras = sig.parameters
-        values = list(paras.values())[1:]  # paras.value()[0] is self
+        if not any(isinstance(p, Option) for p in args) and not any(isinstance(v, Option) for v in kw.values()):
+            return object.__new__(cls)
+        values, paras = _cached_init_sig(cls)
         for i, p in enumerate(args):
             if isinstance(p, Option):
                 ann = values[i].annotation
@@ -289,13 +346,14 @@ class ModuleBase(SessionConfigableBase, metaclass=_MetaBind):
         super().__init__(id=id, name=name, group_id=group_id)
         self._submodules = []
         self._evalset = None
+        self._eval_batch_size = None
         self._return_trace = return_trace
         self.mode_list = ('train', 'server', 'eval')
         self._used_by_moduleid = None
         self._options = []
         self.eval_result = None
         self._use_cache: Union[bool, str] = False
-        self._hooks = []
+        self._hooks = HookList()
         register_hooks(self, resolve_builtin_hooks(self))
 
     def __setattr__(self, name: str, value):
@@ -310,35 +368,37 @@ class ModuleBase(SessionConfigableBase, metaclass=_MetaBind):
         return super().__setattr__(name, value)
 
     def __getattr__(self, key):
-        def _setattr(v, *, _return_value=self, **kw):
-            k = key[:-7] if key.endswith('_method') else key
-            if isinstance(v, tuple) and len(v) == 2 and isinstance(v[1], dict):
-                kw.update(v[1])
-                v = v[0]
-            if len(kw) > 0:
-                setattr(self, f'_{k}_args', kw)
-            setattr(self, f'_{k}', v)
-            if hasattr(self, f'_{k}_setter_hook'): getattr(self, f'_{k}_setter_hook')()
-            return _return_value
-        keys = self.__class__.builder_keys
-        if key in keys:
+        cls = self.__class__
+        if key in cls._builder_keys_set:
+            def _setattr(v, *, _return_value=self, **kw):
+                k = key[:-7] if key.endswith('_method') else key
+                if isinstance(v, tuple) and len(v) == 2 and isinstance(v[1], dict):
+                    kw.update(v[1])
+                    v = v[0]
+                if len(kw) > 0:
+                    setattr(self, f'_{k}_args', kw)
+                setattr(self, f'_{k}', v)
+                if hasattr(self, f'_{k}_setter_hook'): getattr(self, f'_{k}_setter_hook')()
+                return _return_value
             return _setattr
-        elif key.startswith('_') and key[1:] in keys:
+        elif key in cls._builder_priv_keys:
             return None
-        elif key.startswith('_') and key.endswith('_args') and (key[1:-5] in keys or f'{key[1:-4]}method' in keys):
+        elif key in cls._builder_args_keys:
             return dict()
-        raise AttributeError(f'{self.__class__} object has no attribute {key}')
+        raise AttributeError(f'{cls} object has no attribute {key}')
 
     def __call__(self, *args, **kw):
-        kw.update(locals['global_parameters'].get(self._module_id, dict()))
-        if (files := locals['lazyllm_files'].get(self._module_id)) is not None: kw['lazyllm_files'] = files
-        if (history := locals['chat_history'].get(self._module_id)) is not None: kw['llm_chat_history'] = history
+        mid, loc = self._module_id, locals  # bind once: each subscript walks the session-local proxy
+        if (params := loc['global_parameters'].get(mid)) is not None: kw.update(params)
+        if (files := loc['lazyllm_files'].get(mid)) is not None: kw['lazyllm_files'] = files
+        if (history := loc['chat_history'].get(mid)) is not None: kw['llm_chat_history'] = history
 
         if args and isinstance(args[0], kwargs): args, kw = [], {**args[0], **kw}
 
-        r = execution_with_hooks(
+        with hook_execution(
             self, *args, map_exception=lambda e: _change_exception_type(e, ModuleExecutionError), **kw,
-        )(self._call_impl)(*args, **kw)
+        ) as hooked_call:
+            r = hooked_call(self._call_impl, *args, **kw)
 
         if self._return_trace:
             lazyllm.FileSystemQueue.get_instance('lazy_trace').enqueue(str(r))
@@ -375,11 +435,15 @@ class ModuleBase(SessionConfigableBase, metaclass=_MetaBind):
         return self
 
     def _clear_usage(self):
-        globals['usage'].pop(self._module_id, None)
+        usage = globals['usage']
+        if usage: usage.pop(self._module_id, None)
 
     # interfaces
     def forward(self, *args, **kw): raise NotImplementedError
 
+    def batch_forward(self, items: List):
+        return [self(**item) if isinstance(item, dict) else self(item) for item in items]
+
     def register_hook(self, hook_type: Union[LazyLLMHook, Callable]):
         if not isinstance(hook_type, type) and not isinstance(hook_type, LazyLLMHook) and callable(hook_type):
             hook_type = LazyLLMFuncHook(hook_type)
@@ -394,14 +458,16 @@ class ModuleBase(SessionConfigableBase, metaclass=_MetaBind):
             self._hooks.remove(hook_type)
 
     def clear_hooks(self):
-        self._hooks = []
+        self._hooks = HookList()
 
     def _get_train_tasks(self): return None
     def _get_deploy_tasks(self): return None
     def _get_post_process_tasks(self): return None
 
     def _set_mid(self, mid=None):
-        self._config_id = mid if mid else str(uuid.uuid4().hex)
+        # os.urandom keeps the 32-hex-char format of uuid4().hex without the UUID object overhead;
+        # module construction is a bulk operation when building large flows
+        self._config_id = mid if mid else os.urandom(16).hex()
         return self
 
     @property
@@ -412,7 +478,7 @@ class ModuleBase(SessionConfigableBase, metaclass=_MetaBind):
     def submodules(self):
         return self._submodules
 
-    def evalset(self, evalset, load_f=None, collect_f=lambda x: x):
+    def evalset(self, evalset, load_f=None, collect_f=lambda x: x, batch_size: Optional[int] = None):
         if isinstance(evalset, str) and os.path.exists(evalset):
             with open(evalset) as f:
                 assert callable(load_f)
@@ -420,15 +486,35 @@ class ModuleBase(SessionConfigableBase, metaclass=_MetaBind):
         else:
             self._evalset = evalset
         self.eval_result_collet_f = collect_f
+        self._eval_batch_size = batch_size
+
+    # submit long items first so they do not stall completion at the tail of an eval run;
+    # small sets skip the sort since scheduling order barely matters there
+    _eval_sort_min_size = 16
 
     # TODO: add lazyllm.eval
     def _get_eval_tasks(self):
         def set_result(x): self.eval_result = x
 
+        def infer_one(item):
+            return self(**item) if isinstance(item, dict) else self(item)
+
         def parallel_infer():
-            with ThreadPoolExecutor(max_workers=200) as executor:
-                results = list(executor.map(lambda item: self(**item)
-                                            if isinstance(item, dict) else self(item), self._evalset))
+            evalset, executor = self._evalset, _eval_executor()
+            if (bs := self._eval_batch_size) and bs > 1:
+                chunks = [evalset[i:i + bs] for i in range(0, len(evalset), bs)]
+                results = []
+                for part in executor.map(self.batch_forward, chunks):
+                    results.extend(part)
+                return results
+            if len(evalset) < self._eval_sort_min_size:
+                return list(executor.map(infer_one, evalset))
+            estimate = getattr(self, '_estimate_token_usage', len)
+            order = sorted(range(len(evalset)), key=lambda i: estimate(str(evalset[i])), reverse=True)
+            futures = [(i, executor.submit(infer_one, evalset[i])) for i in order]
+            results = [None] * len(evalset)
+            for i, future in futures:
+                results[i] = future.result()
             return results
         if self._evalset:
             return Pipeline(parallel_infer,
@@ -442,32 +528,33 @@ class ModuleBase(SessionConfigableBase, metaclass=_MetaBind):
         if type(mode) is not list: mode = [mode]
         for item in mode:
             assert item in self.mode_list, f'Cannot find {item} in mode list: {self.mode_list}'
-        # dfs to get all train tasks
+        # iterative post-order dfs to get all train tasks, skipping already-visited modules before descent
         train_tasks, deploy_tasks, eval_tasks, post_process_tasks = FlatList(), FlatList(), FlatList(), FlatList()
-        stack, visited = [(self, iter(self.submodules if recursive else []))], set()
-        while len(stack) > 0:
-            try:
-                top = next(stack[-1][1])
-                stack.append((top, iter(top.submodules)))
-            except StopIteration:
-                top = stack.pop()[0]
-                if top._module_id in visited: continue
-                visited.add(top._module_id)
+        stack, visited = deque([(self, False)]), set()
+        while stack:
+            top, expanded = stack.pop()
+            if expanded:
                 if 'train' in mode: train_tasks.absorb(top._get_train_tasks())
                 if 'server' in mode: deploy_tasks.absorb(top._get_deploy_tasks())
                 if 'eval' in mode: eval_tasks.absorb(top._get_eval_tasks())
                 post_process_tasks.absorb(top._get_post_process_tasks())
-
-        if 'train' in mode and len(train_tasks) > 0:
-            Parallel(*train_tasks).set_sync(True)()
-        if 'server' in mode and len(deploy_tasks) > 0:
+                continue
+            if top._module_id in visited: continue
+            visited.add(top._module_id)
+            stack.append((top, True))
+            subs = top.submodules if recursive else []
+            stack.extend((sub, False) for sub in reversed(subs))
+
+        if 'train' in mode:
+            _run_stage_tasks(train_tasks, lazyllm.config['update_train_workers'])
+        if 'server' in mode:
             if redis_client:
-                Parallel(*deploy_tasks).set_sync(False)()
+                _run_stage_tasks(deploy_tasks, lazyllm.config['update_deploy_workers'], block=False)
             else:
-                Parallel.sequential(*deploy_tasks)()
-        if 'eval' in mode and len(eval_tasks) > 0:
-            Parallel.sequential(*eval_tasks)()
-        Parallel.sequential(*post_process_tasks)()
+                _run_stage_tasks(deploy_tasks, 1)
+        if 'eval' in mode:
+            _run_stage_tasks(eval_tasks, lazyllm.config['update_eval_workers'])
+        _run_stage_tasks(post_process_tasks, 1)
         return self
 
     def update(self, *, recursive: bool = True):
@@ -492,6 +579,10 @@ class ModuleBase(SessionConfigableBase, metaclass=_MetaBind):
         return options
 
     def _overwrote(self, f):
+        if f in self._overwrote_candidates:
+            cls = self.__class__
+            overwrote_set = cls.__dict__.get('_overwrote_set')
+            return f in (overwrote_set if overwrote_set is not None else cls._precompute_overwrote_set())
         return getattr(self.__class__, f) is not getattr(__class__, f)
 
     def __repr__(self):
@@ -517,6 +608,9 @@ class ModuleBase(SessionConfigableBase, metaclass=_MetaBind):
     def _cache_miss_handler(self): pass
 
 
+ModuleBase._precompute_builder_keys()  # __init_subclass__ only covers subclasses
+
+
 class ActionModule(ModuleBase):
     def __init__(self, *action, return_trace=False):
         super().__init__(return_trace=return_trace)
@@ -526,15 +620,21 @@ class ActionModule(ModuleBase):
         assert isinstance(action, FlowBase), f'Invalid action type {type(action)}'
         self.action = action
 
+    def __setattr__(self, name: str, value):
+        if name == 'action': self.__dict__['_submodules_cache'] = None
+        return super().__setattr__(name, value)
+
     def forward(self, *args, **kw):
         return self.action(*args, **kw)
 
     @property
     def submodules(self):
+        if self._submodules_cache is not None: return self._submodules_cache
         try:
             if isinstance(self.action, FlowBase):
                 submodule = []
                 self.action.for_each(lambda x: isinstance(x, ModuleBase), lambda x: submodule.append(x))
+                self._submodules_cache = submodule
                 return submodule
         except Exception as e:
             raise RuntimeError(f'{str(e)}\nOriginal traceback:\n{"".join(traceback.format_tb(e.__traceback__))}')
@@ -1,17 +1,21 @@
 import re
-import time
 import json
 import hashlib
 import requests
 import uuid
-import pickle
-import codecs
+import threading
 from typing import Callable, Dict, List, Union, Optional, Tuple, TypedDict
 import copy
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+try:
+    import orjson  # optional accelerator for request-body serialization
+except ImportError:
+    orjson = None
 
 import lazyllm
-from lazyllm import launchers, LOG, package, obj2str, globals, is_valid_url, LazyLLMLaunchersBase, redis_client
+from lazyllm import launchers, LOG, package, obj2str, decode_wire, globals, locals, is_valid_url, \
+    LazyLLMLaunchersBase, redis_client, reset_on_pickle
 from lazyllm.common import _register_trim_module, _get_callsite
 from ..components.formatter import FormatterBase, EmptyFormatter, decode_query_with_filepaths
 from ..components.formatter.formatterbase import LAZYLLM_QUERY_PREFIX, _lazyllm_get_file_list
@@ -52,6 +56,33 @@ def _parse_interleaved_input(input_list: List) -> Tuple[str, List[str]]:
     return ''.join(text_parts), image_paths
 
 
+# group 1 catches english words, numbers and comma; group 2 catches non-ascii chars
+_token_estimate_pattern = re.compile(r'(\b[a-zA-Z0-9]+\b|,)|([^\x00-\x7F])')
+
+
+def _iter_delimited_stream(r, delimiter=b'<|lazyllm_delimiter|>', chunk_size=65536):
+    # manual buffer scan instead of r.iter_lines: one find() per message rather than
+    # per-chunk split/join work inside requests' line buffering
+    buf, pos, dlen, seen = bytearray(), 0, len(delimiter), False
+    for chunk in r.iter_content(chunk_size):
+        if not chunk: continue
+        seen = True
+        buf += chunk
+        while (idx := buf.find(delimiter, pos)) != -1:
+            yield bytes(buf[pos:idx])
+            pos = idx + dlen
+        if pos > chunk_size:  # drop consumed bytes so the buffer stays small
+            del buf[:pos]
+            pos = 0
+    if seen:
+        yield bytes(buf[pos:])
+
+
+def _json_body(obj) -> bytes:
+    # preserialized and posted as `data=` so requests skips its per-call json plumbing
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode()
+
+
 class StaticParams(TypedDict, total=False):
     temperature: float
     top_p: float
@@ -172,9 +203,11 @@ class LLMBase(object):
         return hashlib.md5(content.encode()).hexdigest()
 
 class _UrlHelper(object):
+    @reset_on_pickle(('ready', threading.Event))
     @dataclass
     class _Wrapper:
         url: Optional[str] = None
+        ready: threading.Event = field(default_factory=threading.Event)
 
     def __init__(self, url):
         self._url_wrapper = url if isinstance(url, _UrlHelper._Wrapper) else _UrlHelper._Wrapper(url=url)
@@ -186,11 +219,21 @@ class _UrlHelper(object):
         if not self._url_wrapper.url:
             if redis_client:
                 try:
-                    while not self._url_wrapper.url:
-                        url = redis_client['url'].get(self._url_id)
-                        self._url_wrapper.url = url.decode('utf-8') if url else None
-                        if self._url_wrapper.url: break
-                        time.sleep(lazyllm.config['redis_recheck_delay'])
+                    client = redis_client['url']
+                    if not (url := client.get(self._url_id)):
+                        pubsub = client.subscriber(self._url_id)
+                        try:
+                            url = client.get(self._url_id)  # cover a publish racing the subscribe
+                            delay = lazyllm.config['redis_recheck_delay']
+                            while not url:
+                                if self._url_wrapper.ready.is_set():  # set in-process, no roundtrip needed
+                                    return self._url_wrapper.url
+                                message = pubsub.get_message(timeout=delay)
+                                url = message['data'] if message else client.get(self._url_id)
+                                delay = min(delay * 2, 60)  # backoff for the polling fallback
+                        finally:
+                            pubsub.close()
+                    self._url_wrapper.url = url.decode('utf-8') if isinstance(url, bytes) else url
                 except Exception as e:
                     LOG.error(f'Error accessing Redis: {e}')
                     raise
@@ -198,9 +241,12 @@ class _UrlHelper(object):
 
     def _set_url(self, url):
         if redis_client:
-            redis_client['url'].set(self._url_id, url)
+            client = redis_client['url']
+            client.set(self._url_id, url)
+            client.publish(self._url_id, url)
         LOG.debug(f'url: {url}')
         self._url_wrapper.url = url
+        self._url_wrapper.ready.set()
 
     def _release_url(self):
         if redis_client:
@@ -222,18 +268,17 @@ class UrlModule(ModuleBase, LLMBase, _UrlHelper):
     def _estimate_token_usage(self, text):
         if not isinstance(text, str):
             return 0
-        # extract english words, number and comma
-        pattern = r'\b[a-zA-Z0-9]+\b|,'
-        ascii_words = re.findall(pattern, text)
-        ascii_ch_count = sum(len(ele) for ele in ascii_words)
-        non_ascii_pattern = r'[^\x00-\x7F]'
-        non_ascii_chars = re.findall(non_ascii_pattern, text)
-        non_ascii_char_count = len(non_ascii_chars)
+        ascii_ch_count, non_ascii_char_count = 0, 0
+        for m in _token_estimate_pattern.finditer(text):
+            if (word := m.group(1)) is not None:
+                ascii_ch_count += len(word)
+            else:
+                non_ascii_char_count += 1
         return int(ascii_ch_count / 3.0 + non_ascii_char_count + 1)
 
     def _decode_line(self, line: bytes):
         try:
-            return pickle.loads(codecs.decode(line, 'base64'))
+            return decode_wire(line)
         except Exception:
             return line.decode('utf-8')
 
@@ -243,6 +288,13 @@ class UrlModule(ModuleBase, LLMBase, _UrlHelper):
     def forward(self, *args, **kw): raise NotImplementedError
 
     def __call__(self, *args, **kw):
+        if self._url_wrapper.url is None and not redis_client:
+            # a deploy task in another thread may still be bringing the server up; block on its
+            # readiness event instead of sleep-polling, but only when a deploy has actually been
+            # entered so calling a never-started module still fails immediately
+            deploy_task = getattr(getattr(self, '_impl', None), '_get_deploy_tasks', None)
+            if deploy_task is not None and deploy_task.flag:
+                self._url_wrapper.ready.wait(timeout=lazyllm.config['redis_recheck_delay'])
         assert self._url is not None, f'Please start {self.__class__} first'
         if len(args) > 1:
             return super(__class__, self).__call__(package(args), **kw)
@@ -267,6 +319,19 @@ class _ServerModuleImpl(ModuleBase, _UrlHelper):
         self._num_replicas = num_replicas
         self._security_key = security_key
         self._defined_pos = _get_callsite(depth=3)
+        self._session = self._make_session()
+
+    @staticmethod
+    def _make_session():
+        # reuse connections across calls instead of paying TCP/TLS setup per request;
+        # trust_env/proxies are fixed here so requests skips env scanning on each call
+        session = requests.Session()
+        session.trust_env = False
+        session.proxies = {'http': None, 'https': None}
+        adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=128, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
 
     @lazyllm.once_wrapper
     def _get_deploy_tasks(self):
@@ -320,6 +385,22 @@ class ServerModule(UrlModule):
     def status(self):
         return self._impl._launcher.status
 
+    def batch_forward(self, items: List):
+        # ship the whole batch in one request when the remote module can dispatch it itself;
+        # pre/post functions, hooks, caching and any client-side per-item processing
+        # (formatter, streaming, tracing, session parameters) need the per-item path
+        if (self._impl._m is None or self._impl._pre_func or self._impl._post_func or self._hooks
+                or self._use_cache or self._stream or self._return_trace
+                or not isinstance(self._formatter, EmptyFormatter)
+                or any(locals[key].get(self._module_id) is not None
+                       for key in ('global_parameters', 'lazyllm_files', 'chat_history'))):
+            return super().batch_forward(items)
+        try:
+            return self._call('batch_forward', items)
+        except Exception as e:
+            LOG.warning(f'Batched request failed ({e}), falling back to per-item calls')
+            return super().batch_forward(items)
+
     def _call(self, fname, *args, **kwargs):
         args, kwargs = lazyllm.dump_obj(args), lazyllm.dump_obj(kwargs)
         url = urljoin(self._url.rsplit('/', 1)[0], '_call')
@@ -328,14 +409,14 @@ class ServerModule(UrlModule):
             'Global-Parameters': globals.pickled_data,
             'Session-ID': globals._sid,
         }
-        r = requests.post(url, json=(fname, args, kwargs), headers=headers)
+        r = self._impl._session.post(url, data=_json_body([fname, args, kwargs]), headers=headers)
         if r.status_code != 200:
             try:
                 error_info = r.json()
             except ValueError:
                 error_info = r.text
             raise requests.RequestException(f'{r.status_code}: {error_info}')
-        return pickle.loads(codecs.decode(r.content, 'base64'))
+        return decode_wire(r.content)
 
     def forward(self, __input: Union[Tuple[Union[str, Dict], str], str, Dict] = package(), **kw):  # noqa B008
         headers = {
@@ -347,18 +428,19 @@ class ServerModule(UrlModule):
         data = obj2str((__input, kw))
 
         # context bug with httpx, so we use requests
-        with requests.post(self._url, json=data, stream=True, headers=headers,
-                           proxies={'http': None, 'https': None}) as r:
+        with self._impl._session.post(self._url, data=_json_body(data), stream=True, headers=headers) as r:
             if r.status_code != 200:
                 raise requests.RequestException('\n'.join([c.decode('utf-8') for c in r.iter_content(None)]))
 
-            messages = ''
+            parts, line = [], ''
             with self.stream_output(self._stream):
-                for line in r.iter_lines(delimiter=b'<|lazyllm_delimiter|>'):
+                for line in _iter_delimited_stream(r):
                     line = self._decode_line(line)
                     if self._stream:
-                        self._stream_output(str(line), getattr(self._stream, 'get', lambda x: None)('color'))
-                    messages = (messages + str(line)) if self._stream else line
+                        text = str(line)
+                        self._stream_output(text, getattr(self._stream, 'get', lambda x: None)('color'))
+                        parts.append(text)
+                messages = ''.join(parts) if self._stream else line
 
                 temp_output = self._extract_and_format(messages)
                 return self._formatter(temp_output)
@@ -6,6 +6,7 @@ import threading
 import lazyllm
 from lazyllm.common import ArgsDict, compile_func
 from lazyllm.common import once_wrapper
+from lazyllm.common import encode_wire, decode_wire
 from lazyllm.components.formatter import lazyllm_merge_query, encode_query_with_filepaths, decode_query_with_filepaths
 
 
@@ -272,3 +273,20 @@ class TestCommonRegistry(object):
 
         assert lazyllm.custom.test()(1, 2) == 6
         assert lazyllm.custom.test2()(1, 2) == 8
+
+
+class TestWireFormat(object):
+
+    def test_encode_decode_roundtrip(self):
+        payload = {'query': 'hello', 'files': ['a.png'], 'nested': lazyllm.package((1, 2.5))}
+        for fmt in ('pickle_b64', 'pickle_raw'):
+            with lazyllm.config.temp('wire_format', fmt):
+                assert decode_wire(encode_wire(payload)) == payload
+
+    def test_decode_raw_accepts_b64_peer(self):
+        payload = {'query': 'hello'}
+        with lazyllm.config.temp('wire_format', 'pickle_b64'):
+            data = encode_wire(payload)
+        with lazyllm.config.temp('wire_format', 'pickle_raw'):
+            assert decode_wire(data) == payload
+            assert decode_wire(None) is None
@@ -228,3 +228,74 @@ class TestModule:
 
         assert prl([dict(a=1, b=2), dict(a=3, b=4)]) == 10
         assert prl(dict(a=1, b=2), dict(a=3, b=4)) == 10
+
+    def test_evalset_batch_size(self):
+        class MyModule(lazyllm.ModuleBase):
+            def __init__(self):
+                super().__init__()
+                self.batch_calls = 0
+
+            def forward(self, x):
+                return x * 2
+
+            def batch_forward(self, items):
+                self.batch_calls += 1
+                return super().batch_forward(items)
+
+        m1 = MyModule()
+        m1.evalset(list(range(10)), batch_size=4)
+        m1.update()
+        assert m1.eval_result == [x * 2 for x in range(10)]
+        assert m1.batch_calls == 3
+
+        m2 = MyModule()
+        m2.evalset(list(range(10)))
+        m2.update()
+        assert m2.eval_result == [x * 2 for x in range(10)]
+        assert m2.batch_calls == 0
+
+    def test_module_hooks(self):
+        from lazyllm.hook import HookList, LazyLLMHook
+
+        events = []
+
+        class EarlyHook(LazyLLMHook):
+            __hook_priority__ = 1
+
+            def __init__(self, obj): pass
+            def pre_hook(self, *args, **kw): events.append('early.pre')
+            def post_hook(self, output): events.append('early.post')
+            def finalize(self): events.append('early.finalize')
+
+        class LateHook(EarlyHook):
+            __hook_priority__ = 200
+
+            def pre_hook(self, *args, **kw): events.append('late.pre')
+            def post_hook(self, output): events.append('late.post')
+            def finalize(self): events.append('late.finalize')
+
+        class MyModule(lazyllm.ModuleBase):
+            def forward(self, x):
+                return x + 1
+
+        m = MyModule()
+        assert isinstance(m._hooks, HookList)
+        m._hooks.extend([LateHook, EarlyHook])
+        plan = m._hooks.plan
+        assert plan.index((False, EarlyHook)) < plan.index((False, LateHook))
+
+        assert m(1) == 2
+        assert events.index('early.pre') < events.index('late.pre')
+        assert {'early.post', 'late.post', 'early.finalize', 'late.finalize'} <= set(events)
+
+        stateful = EarlyHook(m)
+        m.register_hook(stateful)
+        assert m._hooks.plan is not plan  # mutation invalidates the cached plan
+        events.clear()
+        assert m(1) == 2
+        assert events.count('early.pre') == 2
+
+        m.clear_hooks()
+        events.clear()
+        assert m(1) == 2
+        assert events == []